@@ -27,6 +27,12 @@ from kpet.schema import Invalid, Struct, Choice, \
 # Schema for universal IDs
 UNIVERSAL_ID_SCHEMA = String(pattern="[.a-zA-Z0-9_-]*")
 
+# Schema for a regex or a list of regexes, resolving to a list of regexes
+REGEX_LIST_SCHEMA = Reduction(Regex(), lambda x: [x], List(Regex()))
+
+# Flags of a regex without any inline flags
+DEFAULT_REGEX_FLAGS = re.compile("").flags
+
 
 class Object:   # pylint: disable=too-few-public-methods
     """An abstract data object"""
@@ -131,57 +137,60 @@ class Pattern(Object):  # pylint: disable=too-few-public-methods
     qualifiers = {"trees", "arches", "components", "sources"}
 
     """An execution target pattern"""
-    def __init__(self, data):
+    def __init__(self, data):  # pylint: disable=super-init-not-called
         """
         Initialize an execution pattern.
 
         Args:
             data:       Pattern data.
         """
-        class NonRecursiveChoice(Choice):
-            """Choice schema preventing recursive recognition"""
-            def __init__(self, *args):
-                super().__init__(*args)
-                self.recognizing = False
-
-            def recognize(self):
-                if self.recognizing:
-                    recognized = self
-                else:
-                    self.recognizing = True
-                    recognized = super().recognize()
-                    self.recognizing = False
-                return recognized
-
-        class OpsOrValues(NonRecursiveChoice):
-            """Pattern operations or values"""
-            def __init__(self):
-                super().__init__(
-                    Null(),
-                    Regex(),
-                    List(self),
-                    Struct(optional={k: self for k in {"not", "and", "or"}})
-                )
-
-        ops_or_values_schema = OpsOrValues()
-
-        class OpsOrQualifiers(NonRecursiveChoice):
-            """Pattern operations or qualifiers"""
-            def __init__(self):
-                fields = {}
-                fields.update({k: self for k in {"not", "and", "or"}})
-                fields.update({k: ops_or_values_schema
-                               for k in Pattern.qualifiers})
-                super().__init__(
-                    List(self),
-                    Struct(optional=fields)
-                )
-
         try:
-            self.data = OpsOrQualifiers().resolve(data)
+            self.data = PATTERN_SCHEMA.resolve(data)
         except Invalid:
             raise Invalid("Invalid pattern")
 
+        self.data = self.__merge_regexes(True, self.data)
+
+    @staticmethod
+    def __merge_regexes(and_op, node):
+        """
+        Merge regexes "or'ed" together in a pattern node into a single
+        regex, so target values are matched once, instead of once per
+        regex.
+
+        Args:
+            and_op:     True if the node items are "and'ed" together,
+                        False if "or'ed".
+            node:       The pattern node to merge regexes in.
+
+        Returns:
+            The pattern node with regexes merged.
+        """
+        if isinstance(node, dict):
+            return {name: Pattern.__merge_regexes(name != "or", sub_node)
+                    for name, sub_node in node.items()}
+        if not isinstance(node, list):
+            return node
+        node = [Pattern.__merge_regexes(True, sub_node) for sub_node in node]
+        if and_op:
+            return node
+        # Regexes with groups could have backreferences broken by merging,
+        # and global inline flags would apply to the whole merged regex
+        regexes = [sub_node for sub_node in node
+                   if isinstance(sub_node, RE) and not sub_node.groups and
+                   sub_node.flags == DEFAULT_REGEX_FLAGS]
+        if len(regexes) < 2:
+            return node
+        try:
+            merged_regex = re.compile("|".join("(?:" + regex.pattern + ")"
+                                               for regex in regexes))
+        except re.error:
+            # E.g. a regex with a no-op global flag, which can't be embedded
+            return node
+        return [merged_regex] + [sub_node for sub_node in node
+                                 if not any(sub_node is regex
+                                            for regex in regexes)]
+
     # Documentation overhead for multiple functions would be too big, and
     # spread-out logic too hard to grasp.
     # pylint: disable=too-many-branches
@@ -273,34 +282,77 @@ class Pattern(Object):  # pylint: disable=too-few-public-methods
         return node_matches is None or node_matches
 
 
+class _NonRecursiveChoice(Choice):
+    """Choice schema preventing recursive recognition"""
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.recognizing = False
+
+    def recognize(self):
+        if self.recognizing:
+            recognized = self
+        else:
+            self.recognizing = True
+            recognized = super().recognize()
+            self.recognizing = False
+        return recognized
+
+
+class _PatternOpsOrValues(_NonRecursiveChoice):
+    """Pattern operations or values"""
+    def __init__(self):
+        super().__init__(
+            Null(),
+            Regex(),
+            List(self),
+            Struct(optional={k: self for k in {"not", "and", "or"}})
+        )
+
+
+class _PatternOpsOrQualifiers(_NonRecursiveChoice):
+    """Pattern operations or qualifiers"""
+    def __init__(self):
+        ops_or_values_schema = _PatternOpsOrValues()
+        fields = {}
+        fields.update({k: self for k in {"not", "and", "or"}})
+        fields.update({k: ops_or_values_schema
+                       for k in Pattern.qualifiers})
+        super().__init__(
+            List(self),
+            Struct(optional=fields)
+        )
+
+
+# Schema for execution target pattern data
+PATTERN_SCHEMA = _PatternOpsOrQualifiers()
+
+# Schema for test case data
+CASE_SCHEMA = Struct(
+    required=dict(
+        max_duration_seconds=Int(),
+    ),
+    optional=dict(
+        name=String(),
+        universal_id=UNIVERSAL_ID_SCHEMA,
+        host_type_regex=Regex(),
+        hostRequires=String(),
+        partitions=String(),
+        kickstart=String(),
+        sets=REGEX_LIST_SCHEMA,
+        pattern=Class(Pattern),
+        waived=Boolean(),
+        role=String(),
+        environment=Dict(String()),
+        maintainers=List(String()),
+    )
+)
+
+
 class Case(Object):     # pylint: disable=too-few-public-methods
     """Test case"""
 
     def __init__(self, data):
-        sets_schema = Reduction(Regex(), lambda x: [x], List(Regex()))
-        super().__init__(
-            "case",
-            Struct(
-                required=dict(
-                    max_duration_seconds=Int(),
-                ),
-                optional=dict(
-                    name=String(),
-                    universal_id=UNIVERSAL_ID_SCHEMA,
-                    host_type_regex=Regex(),
-                    hostRequires=String(),
-                    partitions=String(),
-                    kickstart=String(),
-                    sets=sets_schema,
-                    pattern=Class(Pattern),
-                    waived=Boolean(),
-                    role=String(),
-                    environment=Dict(String()),
-                    maintainers=List(String()),
-                )
-            ),
-            data
-        )
+        super().__init__("case", CASE_SCHEMA, data)
         if self.pattern is None:
             self.pattern = Pattern({})
         if self.environment is None:
@@ -323,6 +375,28 @@ class Case(Object):     # pylint: disable=too-few-public-methods
         return self.pattern.matches(target)
 
 
+# Schema for test suite data
+SUITE_SCHEMA = Struct(
+    required=dict(
+        location=String(),
+        cases=List(Class(Case))
+    ),
+    optional=dict(
+        name=String(),
+        universal_id=UNIVERSAL_ID_SCHEMA,
+        host_type_regex=Regex(),
+        hostRequires=String(),
+        partitions=String(),
+        kickstart=String(),
+        pattern=Class(Pattern),
+        sets=REGEX_LIST_SCHEMA,
+        origin=String(),
+        waived=Boolean(),
+        maintainers=List(String())
+    )
+)
+
+
 class Suite(Object):    # pylint: disable=too-few-public-methods
     """Test suite"""
 
@@ -340,31 +414,7 @@ class Suite(Object):    # pylint: disable=too-few-public-methods
                               format(self.name, case.name))
 
     def __init__(self, data):
-        sets_schema = Reduction(Regex(), lambda x: [x], List(Regex()))
-
-        super().__init__(
-            "suite",
-            Struct(
-                required=dict(
-                    location=String(),
-                    cases=List(Class(Case))
-                ),
-                optional=dict(
-                    name=String(),
-                    universal_id=UNIVERSAL_ID_SCHEMA,
-                    host_type_regex=Regex(),
-                    hostRequires=String(),
-                    partitions=String(),
-                    kickstart=String(),
-                    pattern=Class(Pattern),
-                    sets=sets_schema,
-                    origin=String(),
-                    waived=Boolean(),
-                    maintainers=List(String())
-                )
-            ),
-            data
-        )
+        super().__init__("suite", SUITE_SCHEMA, data)
         if self.pattern is None:
             self.pattern = Pattern({})
         if self.maintainers is None:
@@ -384,6 +434,37 @@ class Suite(Object):    # pylint: disable=too-few-public-methods
         return self.pattern.matches(target)
 
 
+def _inherit_host_type(data):
+    """Convert legacy host type data to the current schema"""
+    if "tasks" in data:
+        data["preboot_tasks"] = data.pop("tasks")
+    return data
+
+
+# Schema for host type data
+# TODO Drop the old schema once kpet-db is switched to the new one
+HOST_TYPE_SCHEMA = Succession(
+    Struct(optional=dict(
+        ignore_panic=Boolean(),
+        hostRequires=String(),
+        hostname=String(),
+        partitions=String(),
+        kickstart=String(),
+        tasks=String(),
+    )),
+    _inherit_host_type,
+    Struct(optional=dict(
+        ignore_panic=Boolean(),
+        hostRequires=String(),
+        hostname=String(),
+        partitions=String(),
+        kickstart=String(),
+        preboot_tasks=String(),
+        postboot_tasks=String(),
+    )),
+)
+
+
 class HostType(Object):     # pylint: disable=too-few-public-methods
     """Host type"""
 
@@ -391,40 +472,38 @@ class HostType(Object):     # pylint: disable=too-few-public-methods
         """
         Initialize a host type.
         """
-        # TODO Drop the old schema once kpet-db is switched to the new one
-        def inherit(data):
-            if "tasks" in data:
-                data["preboot_tasks"] = data.pop("tasks")
-            return data
-        super().__init__(
-            "host type",
-            Succession(
-                Struct(optional=dict(
-                    ignore_panic=Boolean(),
-                    hostRequires=String(),
-                    hostname=String(),
-                    partitions=String(),
-                    kickstart=String(),
-                    tasks=String(),
-                )),
-                inherit,
-                Struct(optional=dict(
-                    ignore_panic=Boolean(),
-                    hostRequires=String(),
-                    hostname=String(),
-                    partitions=String(),
-                    kickstart=String(),
-                    preboot_tasks=String(),
-                    postboot_tasks=String(),
-                )),
-            ),
-            data
-        )
+        super().__init__("host type", HOST_TYPE_SCHEMA, data)
 
 
 # Host type to use when there are none defined
 DEFAULT_HOST_TYPE = HostType({})
 
+# Schema for database data
+BASE_SCHEMA = ScopedYAMLFile(
+    Struct(
+        required=dict(
+        ),
+        optional=dict(
+            suites=List(YAMLFile(Class(Suite))),
+            trees=Dict(
+                Struct(required=dict(template=String()),
+                       optional=dict(arches=REGEX_LIST_SCHEMA))
+            ),
+            arches=List(String()),
+            components=Dict(String()),
+            sets=Dict(String()),
+            host_types=Dict(Class(HostType)),
+            host_type_regex=Regex(),
+            recipesets=Dict(List(String())),
+            variables=Dict(
+                Struct(required=dict(description=String()),
+                       optional=dict(default=String()))
+            ),
+            origins=Dict(String()),
+        )
+    )
+)
+
 
 class Base(Object):     # pylint: disable=too-few-public-methods
     """Database"""
@@ -601,36 +680,7 @@ class Base(Object):     # pylint: disable=too-few-public-methods
         """
         assert self.is_dir_valid(dir_path)
 
-        arches_schema = Reduction(Regex(), lambda x: [x], List(Regex()))
-
-        super().__init__(
-            "database",
-            ScopedYAMLFile(
-                Struct(
-                    required=dict(
-                    ),
-                    optional=dict(
-                        suites=List(YAMLFile(Class(Suite))),
-                        trees=Dict(
-                            Struct(required=dict(template=String()),
-                                   optional=dict(arches=arches_schema))
-                        ),
-                        arches=List(String()),
-                        components=Dict(String()),
-                        sets=Dict(String()),
-                        host_types=Dict(Class(HostType)),
-                        host_type_regex=Regex(),
-                        recipesets=Dict(List(String())),
-                        variables=Dict(
-                            Struct(required=dict(description=String()),
-                                   optional=dict(default=String()))
-                        ),
-                        origins=Dict(String()),
-                    )
-                )
-            ),
-            dir_path + "/index.yaml"
-        )
+        super().__init__("database", BASE_SCHEMA, dir_path + "/index.yaml")
 
         self.dir_path = dir_path
         if self.trees is None:
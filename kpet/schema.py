@@ -24,6 +24,11 @@ import yaml
 # TODO Switch to just using re.Pattern once upgraded to Python 3.7 or later
 RE = type(re.compile(""))
 
+# The safe YAML loader to use: the libyaml-based one, if PyYAML was built
+# with libyaml, and the pure-Python one otherwise
+YAML_SAFE_LOADER = getattr(yaml, "CSafeLoader",  # pylint: disable=invalid-name
+                           yaml.SafeLoader)
+
 
 def _get_re_error_type():
     """
@@ -367,7 +372,8 @@ class YAMLFile(String):
 
         # Load the data
         with open(file_path, "r") as resolved_data_file:
-            resolved_data = yaml.safe_load(resolved_data_file)
+            resolved_data = yaml.load(resolved_data_file,
+                                      Loader=YAML_SAFE_LOADER)
 
         # Resolve loaded data
         try:
@@ -389,7 +395,8 @@ class ScopedYAMLFile(YAMLFile):
 
         # Load the data
         with open(file_path, "r") as resolved_data_file:
-            resolved_data = yaml.safe_load(resolved_data_file)
+            resolved_data = yaml.load(resolved_data_file,
+                                      Loader=YAML_SAFE_LOADER)
 
         # Validate and resolve loaded data
         orig_dir_path = os.getcwd()
@@ -42,24 +42,24 @@ class DataTest(unittest.TestCase):
         """
         Check that Object raiser Invalid exception if the schema doesn't match.
         """
-        self.tmpdir = '/tmp/assets'
+        dbdir = os.path.join(self.tmpdir, 'assets')
         path2assets = os.path.join(os.path.dirname(__file__),
                                    'assets/db/general')
-        shutil.copytree(path2assets, self.tmpdir)
+        shutil.copytree(path2assets, dbdir)
 
-        suite = os.path.join(self.tmpdir, 'suites/default/index.yaml')
+        suite = os.path.join(dbdir, 'suites/default/index.yaml')
 
         with open(suite, 'r') as fhandle:
             mydata = fhandle.read()
-            mydata = mydata.replace('maintainers:', 'maintainers: []')
-            mydata = mydata.replace('- maint1', '')
+        mydata = mydata.replace('maintainers:', 'maintainers: []')
+        mydata = mydata.replace('- maint1', '')
 
-            # overwrite the file, without required 'maintainers: field'
-            with open(suite, 'w') as fhandle2:
-                fhandle2.write(mydata)
+        # overwrite the file, without required 'maintainers: field'
+        with open(suite, 'w') as fhandle:
+            fhandle.write(mydata)
 
         with self.assertRaises(data.Invalid):
-            data.Base(self.tmpdir)
+            data.Base(dbdir)
 
 
 class DataPatternTest(unittest.TestCase):
@@ -172,6 +172,22 @@ class DataPatternTest(unittest.TestCase):
         self.assertMismatch(dict(sources={"or": ["a", "a"]}), sources={"b"})
         self.assertMatch(dict(sources={"or": ["a", "b"]}), sources={"b"})
         self.assertMatch(dict(sources={"or": ["b", "b"]}), sources={"b"})
+        self.assertMatch(dict(sources={"or": ["a", "ab"]}), sources={"ab"})
+        self.assertMatch(dict(sources={"or": ["a", "b", None]}),
+                         sources=data.Target.ALL)
+        self.assertMismatch(dict(sources={"or": ["a", "b", None]}),
+                            sources={"c"})
+        self.assertMatch(dict(sources={"or": ["(a)\\1", "b"]}),
+                         sources={"aa"})
+        self.assertMismatch(dict(sources={"or": ["(a)\\1", "b"]}),
+                            sources={"a"})
+        self.assertMatch(dict(sources={"or": ["(?i)A", "b"]}), sources={"a"})
+        self.assertMismatch(dict(sources={"or": ["(?i)A", "b"]}),
+                            sources={"B"})
+        self.assertMatch(dict(sources={"or": ["(?u)a", "b"]}), sources={"a"})
+        self.assertMatch(dict(sources={"or": ["(?u)a", "b"]}), sources={"b"})
+        self.assertMismatch(dict(sources=["a", "b"]), sources={"a"})
+        self.assertMatch(dict(sources=["a.*", ".*b"]), sources={"ab"})
 
     def test_not(self):
         """Check negation works"""
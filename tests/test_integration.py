@@ -14,26 +14,52 @@
 """Integration tests"""
 import re
 import sys
+import functools
 import os.path
 import subprocess
 import textwrap
 import unittest
 import shutil
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout, redirect_stderr
+from io import StringIO
+import kpet as kpet_module
 
 
-# Initial command-line arguments invoking kpet
-KPET_ARGV = []
+# True if kpet should be executed in a subprocess, via the in-tree
+# executable, instead of being called in-process
+KPET_SUBPROCESS = bool(os.environ.get("KPET_TEST_SUBPROCESS"))
 
-# If running under "coverage"
-if "coverage" in sys.modules:
+# Initial command-line arguments invoking kpet in a subprocess
+KPET_ARGV = ()
+
+# If running kpet in subprocesses under "coverage". In-process invocations
+# are measured by the running "coverage" directly.
+if KPET_SUBPROCESS and "coverage" in sys.modules:
     # Run our invocations of kpet under "coverage" as well to collect coverage
     # NOTE Keep command line in sync with tox.ini
-    KPET_ARGV += "coverage run -p --branch --source=kpet".split(" ")
+    KPET_ARGV += tuple("coverage run -p --branch --source=kpet".split(" "))
 
 # Add path to in-tree kpet executable, relative for more readable output
-KPET_ARGV += [os.path.relpath(os.path.join(os.path.dirname(__file__),
-                                           "../bin/kpet"))]
+KPET_ARGV += (os.path.relpath(os.path.join(os.path.dirname(__file__),
+                                           "../bin/kpet")),)
+
+# Absolute path to the test asset directory, independent of the current
+# directory, so tests can be run from any directory and by parallel workers
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          "assets")
+# Absolute path to the database asset directory
+DB_ASSETS_DIR = os.path.join(ASSETS_DIR, "db")
+# Absolute path to the patch asset directory
+PATCH_ASSETS_DIR = os.path.join(ASSETS_DIR, "patches")
+
+# Expected "<job>" tokens with only "suite1 - case1" generated
+SUITE1_JOB_TOKENS = "HOST suite1 - case1".split()
+# Expected "<job>" tokens with only "suite2 - case2" generated
+SUITE2_JOB_TOKENS = "HOST suite2 - case2".split()
+# Expected "<job>" tokens with both "suite1 - case1" and "suite2 - case2"
+BOTH_SUITES_JOB_TOKENS = "HOST suite1 - case1 suite2 - case2".split()
 
 COMMONTREE_XML = """
 <job>
@@ -86,8 +112,7 @@ def get_db_path(db_name):
     Returns:
         The full path to the database asset directory.
     """
-    return os.path.relpath(os.path.join(os.path.dirname(__file__),
-                                        "assets/db", db_name))
+    return os.path.join(DB_ASSETS_DIR, db_name)
 
 
 def get_patch_path(patch_name):
@@ -100,13 +125,19 @@ def get_patch_path(patch_name):
     Returns:
         The full path to the patch asset directory.
     """
-    return os.path.relpath(os.path.join(os.path.dirname(__file__),
-                                        "assets/patches", patch_name))
+    return os.path.join(PATCH_ASSETS_DIR, patch_name)
 
 
-def kpet(*args):
+# Paths to patches touching files "a", "b", "c"; "d", "e", "f"; and "g",
+# "h", "i" respectively
+PATCH_ABC = get_patch_path("misc/files_abc.diff")
+PATCH_DEF = get_patch_path("misc/files_def.diff")
+PATCH_GHI = get_patch_path("misc/files_ghi.diff")
+
+
+def kpet_subprocess(*args):
     """
-    Execute kpet with specified arguments.
+    Execute kpet with specified arguments in a subprocess.
 
     Args:
         args:   Command-line arguments to pass to kpet.
@@ -114,13 +145,57 @@ def kpet(*args):
     Returns:
         Exit status, standard output, standard error
     """
-    process = subprocess.Popen(KPET_ARGV + list(args),
+    process = subprocess.Popen([*KPET_ARGV, *args],
                                stdout=subprocess.PIPE,
                                stderr=subprocess.PIPE)
     stdout, stderr = process.communicate()
     return process.returncode, stdout.decode("utf-8"), stderr.decode("utf-8")
 
 
+def kpet_in_process(*args):
+    """
+    Execute kpet with specified arguments in the current process.
+
+    Args:
+        args:   Command-line arguments to pass to kpet.
+
+    Returns:
+        Exit status, standard output, standard error
+    """
+    stdout = StringIO()
+    stderr = StringIO()
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        try:
+            kpet_module.main(list(args))
+            status = 0
+        except SystemExit as exc:
+            # Mimic the interpreter's handling of the exit code
+            if exc.code is None:
+                status = 0
+            elif isinstance(exc.code, int):
+                status = exc.code
+            else:
+                print(exc.code, file=sys.stderr)
+                status = 1
+    return status, stdout.getvalue(), stderr.getvalue()
+
+
+def kpet(*args):
+    """
+    Execute kpet with specified arguments, either in a subprocess, or
+    in-process, depending on KPET_SUBPROCESS.
+
+    Args:
+        args:   Command-line arguments to pass to kpet.
+
+    Returns:
+        Exit status, standard output, standard error
+    """
+    if KPET_SUBPROCESS:
+        return kpet_subprocess(*args)
+    return kpet_in_process(*args)
+
+
 def kpet_with_db(db_name, *args):
     """
     Execute kpet with a database specified by name, and optional extra
@@ -154,6 +229,45 @@ def kpet_run_generate(db_name, *args):
                         "-k", "kernel.tar.gz", "-a", "arch", *args)
 
 
+def kpet_run_generate_many(db_name, args_list):
+    """
+    Execute "kpet run generate" with a database specified by name, once
+    for each of the specified extra argument lists, as kpet_run_generate()
+    does. Executions are run concurrently if kpet is executed in
+    subprocesses, and one after another otherwise, since in-process kpet
+    changes the current directory and redirects standard streams.
+
+    Args:
+        db_name:    Database name (a subdir in the database asset directory).
+        args_list:  A list of extra argument lists to pass to kpet.
+
+    Returns:
+        A list of tuples with exit status, standard output, standard error,
+        one for each element of "args_list", in the same order.
+    """
+    if KPET_SUBPROCESS:
+        with ThreadPoolExecutor(max_workers=len(args_list) or 1) as executor:
+            return list(executor.map(lambda args:
+                                     kpet_run_generate(db_name, *args),
+                                     args_list))
+    return [kpet_run_generate(db_name, *args) for args in args_list]
+
+
+@functools.lru_cache(maxsize=256)
+def compile_output_regex(pattern):
+    """
+    Compile a regular expression for matching kpet output, caching the
+    result.
+
+    Args:
+        pattern:    String representation of the regular expression.
+
+    Returns:
+        The compiled regular expression, with "." matching newlines.
+    """
+    return re.compile(pattern, re.DOTALL)
+
+
 def create_asset_files(path, assets):
     """
     Creates asset files in a given folder from given filenames and content
@@ -167,9 +281,8 @@ def create_asset_files(path, assets):
         A string of the given path
     """
     for filename, content in assets.items():
-        tmp_file = open(os.path.join(path, filename), 'w')
-        tmp_file.write(content)
-        tmp_file.close()
+        with open(os.path.join(path, filename), 'w') as tmp_file:
+            tmp_file.write(content)
 
     return str(path)
 
@@ -205,22 +318,97 @@ class IntegrationTests(unittest.TestCase):
         if result_status != status:
             errors.append("Expected exit status {}, got {}".
                           format(status, result_status))
-        if not re.fullmatch(stdout_matching, result_stdout, re.DOTALL):
+        if not compile_output_regex(stdout_matching).fullmatch(result_stdout):
             errors.append("Stdout doesn't match regex \"{}\":\n{}".
                           format(stdout_matching,
                                  textwrap.indent(result_stdout, "    ")))
-        if not re.fullmatch(stderr_matching, result_stderr, re.DOTALL):
+        if not compile_output_regex(stderr_matching).fullmatch(result_stderr):
             errors.append("Stderr doesn't match regex \"{}\":\n{}".
                           format(stderr_matching,
                                  textwrap.indent(result_stderr, "    ")))
         if errors:
             raise AssertionError("\n".join(errors))
 
-    def setUp(self):
-        self.test_dir = tempfile.mkdtemp()
+    def assertJobTokens(self, output, expected_tokens):
+        """
+        Assert the first "<job>" element in kpet output contains exactly
+        the expected whitespace-separated tokens, in order.
 
-    def tearDown(self):
-        shutil.rmtree(self.test_dir)
+        Args:
+            output:             The kpet output to check.
+            expected_tokens:    The list of all tokens the first "<job>"
+                                element should contain, in order.
+        """
+        start = output.find("<job>")
+        end = output.find("</job>", start)
+        if start < 0 or end < 0:
+            self.fail("No <job> element found in output:\n" +
+                      textwrap.indent(output, "    "))
+        self.assertEqual(output[start + len("<job>"):end].split(),
+                         expected_tokens)
+
+    def assertKpetProducesJob(self, func, *args, tokens):
+        """
+        Assert execution of a kpet-running function succeeds, produces no
+        stderr output, and produces a "<job>" element with specified tokens
+        on stdout.
+
+        Args:
+            func:       Function executing kpet. Must return kpet's
+                        exit status, stdout, and stderr.
+            args:       Arguments to pass to "func".
+            tokens:     A list of whitespace-separated tokens the "<job>"
+                        element should contain, in order.
+        """
+        self.assertKpetResultHasJob(func(*args), tokens)
+
+    def assertKpetResultHasJob(self, result, tokens):
+        """
+        Assert a kpet execution result has zero exit status, no stderr
+        output, and a "<job>" element with specified tokens on stdout.
+
+        Args:
+            result:     A tuple of kpet's exit status, stdout, and stderr.
+            tokens:     A list of whitespace-separated tokens the "<job>"
+                        element should contain, in order.
+        """
+        result_status, result_stdout, result_stderr = result
+        self.assertEqual(result_status, 0,
+                         "Expected exit status 0, stderr:\n" +
+                         textwrap.indent(result_stderr, "    "))
+        self.assertEqual(result_stderr, "")
+        self.assertJobTokens(result_stdout, tokens)
+
+    def assertKpetGeneratesJobs(self, db_name, cases):
+        """
+        Assert "kpet run generate" executions with a database and various
+        extra arguments succeed and produce "<job>" elements with specified
+        tokens. Executions are run concurrently, if possible.
+
+        Args:
+            db_name:    Name of the database asset to test against.
+            cases:      A list of tuples, each containing a tuple of extra
+                        arguments to pass to "kpet run generate", and a list
+                        of tokens the produced "<job>" element should
+                        contain.
+        """
+        results = kpet_run_generate_many(db_name,
+                                         [args for args, tokens in cases])
+        for (args, tokens), result in zip(cases, results):
+            with self.subTest(args=args):
+                self.assertKpetResultHasJob(result, tokens)
+
+    @classmethod
+    def setUpClass(cls):
+        # Root directory for test directories, removed once per class
+        cls.test_root_dir = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_root_dir)
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(dir=self.test_root_dir)
 
     def assertKpetSrcMatchesTwoSuites(self, db_name):
         """
@@ -229,33 +417,18 @@ class IntegrationTests(unittest.TestCase):
         Args:
             db_name:    Name of the database asset to test against.
         """
-        # Both appear in baseline output
-        self.assertKpetProduces(
-            kpet_run_generate, db_name,
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*'
-                            r'suite2 - case2\s*</job>.*')
-        # One appears with its patches
-        self.assertKpetProduces(
-            kpet_run_generate, db_name,
-            get_patch_path("misc/files_abc.diff"),
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # Another appears with its patches
-        self.assertKpetProduces(
-            kpet_run_generate, db_name,
-            get_patch_path("misc/files_def.diff"),
-            stdout_matching=r'.*<job>\s*HOST\s*suite2 - case2\s*</job>.*')
-        # Both appear with their patches
-        self.assertKpetProduces(
-            kpet_run_generate, db_name,
-            get_patch_path("misc/files_abc.diff"),
-            get_patch_path("misc/files_def.diff"),
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*'
-                            r'suite2 - case2\s*</job>.*')
-        # None appear with other patches
-        self.assertKpetProduces(
-            kpet_run_generate, db_name,
-            get_patch_path("misc/files_ghi.diff"),
-            stdout_matching=r'.*<job>\s*</job>.*')
+        self.assertKpetGeneratesJobs(db_name, [
+            # Both appear in baseline output
+            ((), BOTH_SUITES_JOB_TOKENS),
+            # One appears with its patches
+            ((PATCH_ABC,), SUITE1_JOB_TOKENS),
+            # Another appears with its patches
+            ((PATCH_DEF,), SUITE2_JOB_TOKENS),
+            # Both appear with their patches
+            ((PATCH_ABC, PATCH_DEF), BOTH_SUITES_JOB_TOKENS),
+            # None appear with other patches
+            ((PATCH_GHI,), []),
+        ])
 
     def assertKpetSrcMatchesOneOfTwoSuites(self, db_name):
         """
@@ -264,31 +437,18 @@ class IntegrationTests(unittest.TestCase):
         Args:
             db_name:    Name of the database asset to test against.
         """
-        # Only one appears in baseline output
-        self.assertKpetProduces(
-            kpet_run_generate, db_name,
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # One appears with its patches
-        self.assertKpetProduces(
-            kpet_run_generate, db_name,
-            get_patch_path("misc/files_abc.diff"),
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # Another doesn't appear with its patches
-        self.assertKpetProduces(
-            kpet_run_generate, db_name,
-            get_patch_path("misc/files_def.diff"),
-            stdout_matching=r'.*<job>\s*</job>.*')
-        # Only one appears with both suite's patches
-        self.assertKpetProduces(
-            kpet_run_generate, db_name,
-            get_patch_path("misc/files_abc.diff"),
-            get_patch_path("misc/files_def.diff"),
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # None appear with other patches
-        self.assertKpetProduces(
-            kpet_run_generate, db_name,
-            get_patch_path("misc/files_ghi.diff"),
-            stdout_matching=r'.*<job>\s*</job>.*')
+        self.assertKpetGeneratesJobs(db_name, [
+            # Only one appears in baseline output
+            ((), SUITE1_JOB_TOKENS),
+            # One appears with its patches
+            ((PATCH_ABC,), SUITE1_JOB_TOKENS),
+            # Another doesn't appear with its patches
+            ((PATCH_DEF,), []),
+            # Only one appears with both suite's patches
+            ((PATCH_ABC, PATCH_DEF), SUITE1_JOB_TOKENS),
+            # None appear with other patches
+            ((PATCH_GHI,), []),
+        ])
 
     def assertKpetSrcMatchesNoneOfTwoSuites(self, db_name):
         """
@@ -297,17 +457,13 @@ class IntegrationTests(unittest.TestCase):
         Args:
             db_name:    Name of the database asset to test against.
         """
-        # They don't appear in baseline output
-        self.assertKpetProduces(
-            kpet_run_generate, db_name,
-            stdout_matching=r'.*<job>\s*</job>.*')
-        # They don't appear when all of their patches and extras are specified
-        self.assertKpetProduces(
-            kpet_run_generate, db_name,
-            get_patch_path("misc/files_abc.diff"),
-            get_patch_path("misc/files_def.diff"),
-            get_patch_path("misc/files_ghi.diff"),
-            stdout_matching=r'.*<job>\s*</job>.*')
+        self.assertKpetGeneratesJobs(db_name, [
+            # They don't appear in baseline output
+            ((), []),
+            # They don't appear when all of their patches and extras are
+            # specified
+            ((PATCH_ABC, PATCH_DEF, PATCH_GHI), []),
+        ])
 
     def assertKpetSchemaInvalidError(self, db_name, expectedError):
         """
@@ -324,9 +480,9 @@ class IntegrationTests(unittest.TestCase):
         # It is still thrown when all of the patches and extras are specified
         self.assertKpetProduces(
             kpet_run_generate, db_name,
-            get_patch_path("misc/files_abc.diff"),
-            get_patch_path("misc/files_def.diff"),
-            get_patch_path("misc/files_ghi.diff"),
+            PATCH_ABC,
+            PATCH_DEF,
+            PATCH_GHI,
             status=1,
             stdout_matching=r'.*',
             stderr_matching=r'.*kpet.schema.Invalid: ' + expectedError + '.*')
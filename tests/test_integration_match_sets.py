@@ -13,7 +13,36 @@
 # Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
 """Integration tests expecting a match"""
 from tests.test_integration import (IntegrationTests, kpet_run_generate,
-                                    COMMONTREE_XML, create_asset_files)
+                                    COMMONTREE_XML, create_asset_files,
+                                    SUITE1_JOB_TOKENS, SUITE2_JOB_TOKENS)
+
+
+# Database index.yaml with three sets and one suite
+INDEX_WITH_SETS_YAML = """
+    host_type_regex: ^normal
+    host_types:
+        normal: {}
+    recipesets:
+        rcs1:
+          - normal
+    arches:
+        - arch
+    trees:
+        tree:
+            template: tree.xml
+    sets:
+        foo: "Lorem"
+        bar: "ipsum"
+        baz: "dolor"
+    suites:
+        - suite1.yaml
+"""
+
+# Database index.yaml with three sets and two suites
+INDEX_WITH_SETS_AND_TWO_SUITES_YAML = \
+    INDEX_WITH_SETS_YAML + """
+        - suite2.yaml
+"""
 
 
 class IntegrationMatchSetsTests(IntegrationTests):
@@ -22,26 +51,7 @@ class IntegrationMatchSetsTests(IntegrationTests):
     def test_match_one_suite(self):
         """Test set matching by matching a single suite and all its cases"""
         assets = {
-            "index.yaml": """
-                host_type_regex: ^normal
-                host_types:
-                    normal: {}
-                recipesets:
-                    rcs1:
-                      - normal
-                arches:
-                    - arch
-                trees:
-                    tree:
-                        template: tree.xml
-                suites:
-                    - suite1.yaml
-                    - suite2.yaml
-                sets:
-                    foo: "Lorem"
-                    bar: "ipsum"
-                    baz: "dolor"
-                """,
+            "index.yaml": INDEX_WITH_SETS_AND_TWO_SUITES_YAML,
             "suite1.yaml": """
                   name: suite1
                   location: somewhere
@@ -69,42 +79,19 @@ class IntegrationMatchSetsTests(IntegrationTests):
 
         assets_path = create_asset_files(self.test_dir, assets)
 
-        # Matches suite
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path, "-s", "foo",
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # Matches a different suite
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path, "-s", "bar",
-            stdout_matching=r'.*<job>\s*HOST\s*suite2 - case2\s*</job>.*')
-        # Doesn't match any suite
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path, "-s", "baz",
-            stdout_matching=r'.*<job>\s</job>.*')
+        self.assertKpetGeneratesJobs(assets_path, [
+            # Matches suite
+            (("-s", "foo"), SUITE1_JOB_TOKENS),
+            # Matches a different suite
+            (("-s", "bar"), SUITE2_JOB_TOKENS),
+            # Doesn't match any suite
+            (("-s", "baz"), []),
+        ])
 
     def test_match_one_case(self):
         """Test set matching by matching a single case"""
         assets = {
-            "index.yaml": """
-                host_type_regex: ^normal
-                host_types:
-                    normal: {}
-                recipesets:
-                    rcs1:
-                      - normal
-                arches:
-                    - arch
-                trees:
-                    tree:
-                        template: tree.xml
-                suites:
-                    - suite1.yaml
-                    - suite2.yaml
-                sets:
-                    foo: "Lorem"
-                    bar: "ipsum"
-                    baz: "dolor"
-                """,
+            "index.yaml": INDEX_WITH_SETS_AND_TWO_SUITES_YAML,
             "suite1.yaml": """
                   name: suite1
                   location: somewhere
@@ -137,14 +124,12 @@ class IntegrationMatchSetsTests(IntegrationTests):
 
         assets_path = create_asset_files(self.test_dir, assets)
 
-        # Matches suite
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path, "-s", "foo",
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # Matches a different suite
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path, "-s", "bar",
-            stdout_matching=r'.*<job>\s*HOST\s*suite2 - case2\s*</job>.*')
+        self.assertKpetGeneratesJobs(assets_path, [
+            # Matches suite
+            (("-s", "foo"), SUITE1_JOB_TOKENS),
+            # Matches a different suite
+            (("-s", "bar"), SUITE2_JOB_TOKENS),
+        ])
 
     def test_match_not_subset_error(self):
         """
@@ -152,25 +137,7 @@ class IntegrationMatchSetsTests(IntegrationTests):
         by having the a case with sets that it's suite doesn't have
         """
         assets = {
-            "index.yaml": """
-                host_type_regex: ^normal
-                host_types:
-                    normal: {}
-                recipesets:
-                    rcs1:
-                      - normal
-                arches:
-                    - arch
-                trees:
-                    tree:
-                        template: tree.xml
-                suites:
-                    - suite1.yaml
-                sets:
-                    foo: "Lorem"
-                    bar: "ipsum"
-                    baz: "dolor"
-                """,
+            "index.yaml": INDEX_WITH_SETS_YAML,
             "suite1.yaml": """
                   name: suite1
                   location: somewhere
@@ -203,25 +170,7 @@ class IntegrationMatchSetsTests(IntegrationTests):
         Make sure we get an error when specifying an unknown set in case
         """
         assets = {
-            "index.yaml": """
-                host_type_regex: ^normal
-                host_types:
-                    normal: {}
-                recipesets:
-                    rcs1:
-                      - normal
-                arches:
-                    - arch
-                trees:
-                    tree:
-                        template: tree.xml
-                suites:
-                    - suite1.yaml
-                sets:
-                    foo: "Lorem"
-                    bar: "ipsum"
-                    baz: "dolor"
-                """,
+            "index.yaml": INDEX_WITH_SETS_YAML,
             "suite1.yaml": """
                   name: suite1
                   location: somewhere
@@ -253,25 +202,7 @@ class IntegrationMatchSetsTests(IntegrationTests):
         Make sure we get an error when specifying an unknown set in suite
         """
         assets = {
-            "index.yaml": """
-                host_type_regex: ^normal
-                host_types:
-                    normal: {}
-                recipesets:
-                    rcs1:
-                      - normal
-                arches:
-                    - arch
-                trees:
-                    tree:
-                        template: tree.xml
-                suites:
-                    - suite1.yaml
-                sets:
-                    foo: "Lorem"
-                    bar: "ipsum"
-                    baz: "dolor"
-                """,
+            "index.yaml": INDEX_WITH_SETS_YAML,
             "suite1.yaml": """
                   name: suite1
                   location: somewhere
@@ -304,25 +235,7 @@ class IntegrationMatchSetsTests(IntegrationTests):
         an unknown set in command line arguments
         """
         assets = {
-            "index.yaml": """
-                host_type_regex: ^normal
-                host_types:
-                    normal: {}
-                recipesets:
-                    rcs1:
-                      - normal
-                arches:
-                    - arch
-                trees:
-                    tree:
-                        template: tree.xml
-                suites:
-                    - suite1.yaml
-                sets:
-                    foo: "Lorem"
-                    bar: "ipsum"
-                    baz: "dolor"
-                """,
+            "index.yaml": INDEX_WITH_SETS_YAML,
             "suite1.yaml": """
                   name: suite1
                   location: somewhere
@@ -12,10 +12,30 @@
 # this program; if not, write to the Free Software Foundation, Inc., 51
 # Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
 """Integration tests expecting a match"""
-from tests.test_integration import (IntegrationTests, kpet_run_generate,
-                                    get_patch_path, COMMONTREE_XML,
+from tests.test_integration import (IntegrationTests, COMMONTREE_XML,
                                     create_asset_files, INDEX_BASE_YAML,
-                                    SUITE_BASE)
+                                    SUITE_BASE, BOTH_SUITES_JOB_TOKENS,
+                                    SUITE1_JOB_TOKENS, SUITE2_JOB_TOKENS,
+                                    PATCH_ABC, PATCH_DEF, PATCH_GHI)
+
+
+# Database index.yaml with two suites
+INDEX_TWO_SUITES_YAML = """
+    host_type_regex: ^normal
+    host_types:
+        normal: {}
+    recipesets:
+        rcs1:
+          - normal
+    arches:
+        - arch
+    trees:
+        tree:
+            template: tree.xml
+    suites:
+        - suite1.yaml
+        - suite2.yaml
+"""
 
 
 class IntegrationMatchSuitesCasesTests(IntegrationTests):
@@ -34,15 +54,12 @@ class IntegrationMatchSuitesCasesTests(IntegrationTests):
 
         assets_path = create_asset_files(self.test_dir, assets)
 
-        # Matches baseline
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # Matches patches
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_abc.diff"),
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
+        self.assertKpetGeneratesJobs(assets_path, [
+            # Matches baseline
+            ((), SUITE1_JOB_TOKENS),
+            # Matches patches
+            ((PATCH_ABC,), SUITE1_JOB_TOKENS),
+        ])
 
     def test_match_sources_one_case_one_pattern(self):
         """Test source-matching a case with one pattern"""
@@ -60,20 +77,14 @@ class IntegrationMatchSuitesCasesTests(IntegrationTests):
 
         assets_path = create_asset_files(self.test_dir, assets)
 
-        # Matches baseline
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # Matches patches it should
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_abc.diff"),
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # Doesn't match patches it shouldn't
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_def.diff"),
-            stdout_matching=r'.*<job>\s*</job>.*')
+        self.assertKpetGeneratesJobs(assets_path, [
+            # Matches baseline
+            ((), SUITE1_JOB_TOKENS),
+            # Matches patches it should
+            ((PATCH_ABC,), SUITE1_JOB_TOKENS),
+            # Doesn't match patches it shouldn't
+            ((PATCH_DEF,), []),
+        ])
 
     def test_match_sources_one_case_two_patterns(self):
         """Test source-matching a case with two patterns"""
@@ -93,31 +104,18 @@ class IntegrationMatchSuitesCasesTests(IntegrationTests):
 
         assets_path = create_asset_files(self.test_dir, assets)
 
-        # Matches baseline
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # Matches first patch
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_abc.diff"),
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # Matches second patch
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_def.diff"),
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # Matches both patches only once
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_abc.diff"),
-            get_patch_path("misc/files_def.diff"),
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # Doesn't match patches it shouldn't
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_ghi.diff"),
-            stdout_matching=r'.*<job>\s*</job>.*')
+        self.assertKpetGeneratesJobs(assets_path, [
+            # Matches baseline
+            ((), SUITE1_JOB_TOKENS),
+            # Matches first patch
+            ((PATCH_ABC,), SUITE1_JOB_TOKENS),
+            # Matches second patch
+            ((PATCH_DEF,), SUITE1_JOB_TOKENS),
+            # Matches both patches only once
+            ((PATCH_ABC, PATCH_DEF), SUITE1_JOB_TOKENS),
+            # Doesn't match patches it shouldn't
+            ((PATCH_GHI,), []),
+        ])
 
     def test_match_sources_two_cases(self):
         """Test source-matching two cases"""
@@ -140,53 +138,24 @@ class IntegrationMatchSuitesCasesTests(IntegrationTests):
 
         assets_path = create_asset_files(self.test_dir, assets)
 
-        # Both match baseline
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*'
-                            r'suite1 - case2\s*</job>.*')
-        # First matches its patch
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_abc.diff"),
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # Second matches its patch
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_def.diff"),
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case2\s*</job>.*')
-        # Both match their patches
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_abc.diff"),
-            get_patch_path("misc/files_def.diff"),
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*'
-                            r'suite1 - case2\s*</job>.*')
-        # None match other patches
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_ghi.diff"),
-            stdout_matching=r'.*<job>\s*</job>.*')
+        self.assertKpetGeneratesJobs(assets_path, [
+            # Both match baseline
+            ((), "HOST suite1 - case1 suite1 - case2".split()),
+            # First matches its patch
+            ((PATCH_ABC,), SUITE1_JOB_TOKENS),
+            # Second matches its patch
+            ((PATCH_DEF,), "HOST suite1 - case2".split()),
+            # Both match their patches
+            ((PATCH_ABC, PATCH_DEF),
+             "HOST suite1 - case1 suite1 - case2".split()),
+            # None match other patches
+            ((PATCH_GHI,), []),
+        ])
 
     def test_match_sources_two_suites(self):
         """Test source-matching two suites"""
         assets = {
-            "index.yaml": """
-                host_type_regex: ^normal
-                host_types:
-                    normal: {}
-                recipesets:
-                    rcs1:
-                      - normal
-                arches:
-                    - arch
-                trees:
-                    tree:
-                        template: tree.xml
-                suites:
-                    - suite1.yaml
-                    - suite2.yaml
-            """,
+            "index.yaml": INDEX_TWO_SUITES_YAML,
             "suite1.yaml": SUITE_BASE.format(1) + """
                     - name: case1
                       max_duration_seconds: 600
@@ -206,53 +175,23 @@ class IntegrationMatchSuitesCasesTests(IntegrationTests):
 
         assets_path = create_asset_files(self.test_dir, assets)
 
-        # Both match baseline
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*'
-                            r'suite2 - case2\s*</job>.*')
-        # First matches its patch
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_abc.diff"),
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # Second matches its patch
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_def.diff"),
-            stdout_matching=r'.*<job>\s*HOST\s*suite2 - case2\s*</job>.*')
-        # Both match their patches
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_abc.diff"),
-            get_patch_path("misc/files_def.diff"),
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*'
-                            r'suite2 - case2\s*</job>.*')
-        # None match other patches
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_ghi.diff"),
-            stdout_matching=r'.*<job>\s*</job>.*')
+        self.assertKpetGeneratesJobs(assets_path, [
+            # Both match baseline
+            ((), BOTH_SUITES_JOB_TOKENS),
+            # First matches its patch
+            ((PATCH_ABC,), SUITE1_JOB_TOKENS),
+            # Second matches its patch
+            ((PATCH_DEF,), SUITE2_JOB_TOKENS),
+            # Both match their patches
+            ((PATCH_ABC, PATCH_DEF), BOTH_SUITES_JOB_TOKENS),
+            # None match other patches
+            ((PATCH_GHI,), []),
+        ])
 
     def test_match_sources_specific_suite(self):
         """Test source-matching with a specific suite"""
         assets = {
-            "index.yaml": """
-                host_type_regex: ^normal
-                host_types:
-                    normal: {}
-                recipesets:
-                    rcs1:
-                      - normal
-                arches:
-                    - arch
-                trees:
-                    tree:
-                        template: tree.xml
-                suites:
-                    - suite1.yaml
-                    - suite2.yaml
-            """,
+            "index.yaml": INDEX_TWO_SUITES_YAML,
             "suite1.yaml": """
                 name: suite1
                 location: somewhere
@@ -280,52 +219,23 @@ class IntegrationMatchSuitesCasesTests(IntegrationTests):
 
         assets_path = create_asset_files(self.test_dir, assets)
 
-        # Only non-specific suite matches baseline
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            stdout_matching=r'.*<job>\s*HOST\s*suite2 - case2\s*</job>.*')
-        # First matches its patch
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_abc.diff"),
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # Second matches its patch
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_def.diff"),
-            stdout_matching=r'.*<job>\s*HOST\s*suite2 - case2\s*</job>.*')
-        # All suites can match if provided appropriate patches
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_abc.diff"),
-            get_patch_path("misc/files_def.diff"),
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*'
-                            r'suite2 - case2\s*</job>.*')
-        # None match other patches
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_ghi.diff"),
-            stdout_matching=r'.*<job>\s*</job>.*')
+        self.assertKpetGeneratesJobs(assets_path, [
+            # Only non-specific suite matches baseline
+            ((), SUITE2_JOB_TOKENS),
+            # First matches its patch
+            ((PATCH_ABC,), SUITE1_JOB_TOKENS),
+            # Second matches its patch
+            ((PATCH_DEF,), SUITE2_JOB_TOKENS),
+            # All suites can match if provided appropriate patches
+            ((PATCH_ABC, PATCH_DEF), BOTH_SUITES_JOB_TOKENS),
+            # None match other patches
+            ((PATCH_GHI,), []),
+        ])
 
     def test_match_sources_specific_case(self):
         """Test source-matching with a specific case"""
         assets = {
-            "index.yaml": """
-                host_type_regex: ^normal
-                host_types:
-                    normal: {}
-                recipesets:
-                    rcs1:
-                      - normal
-                arches:
-                    - arch
-                trees:
-                    tree:
-                        template: tree.xml
-                suites:
-                    - suite1.yaml
-                    - suite2.yaml
-            """,
+            "index.yaml": INDEX_TWO_SUITES_YAML,
             "suite1.yaml": SUITE_BASE.format(1) + """
                     - name: case1
                       max_duration_seconds: 600
@@ -346,29 +256,15 @@ class IntegrationMatchSuitesCasesTests(IntegrationTests):
 
         assets_path = create_asset_files(self.test_dir, assets)
 
-        # Only non-specific case matches baseline
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            stdout_matching=r'.*<job>\s*HOST\s*suite2 - case2\s*</job>.*')
-        # First matches its patch
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_abc.diff"),
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # Second matches its patch
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_def.diff"),
-            stdout_matching=r'.*<job>\s*HOST\s*suite2 - case2\s*</job>.*')
-        # All cases can match if provided appropriate patches
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_abc.diff"),
-            get_patch_path("misc/files_def.diff"),
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*'
-                            r'suite2 - case2\s*</job>.*')
-        # None match other patches
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            get_patch_path("misc/files_ghi.diff"),
-            stdout_matching=r'.*<job>\s*</job>.*')
+        self.assertKpetGeneratesJobs(assets_path, [
+            # Only non-specific case matches baseline
+            ((), SUITE2_JOB_TOKENS),
+            # First matches its patch
+            ((PATCH_ABC,), SUITE1_JOB_TOKENS),
+            # Second matches its patch
+            ((PATCH_DEF,), SUITE2_JOB_TOKENS),
+            # All cases can match if provided appropriate patches
+            ((PATCH_ABC, PATCH_DEF), BOTH_SUITES_JOB_TOKENS),
+            # None match other patches
+            ((PATCH_GHI,), []),
+        ])
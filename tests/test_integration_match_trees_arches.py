@@ -12,9 +12,9 @@
 # this program; if not, write to the Free Software Foundation, Inc., 51
 # Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
 """Integration tests expecting a match"""
-from tests.test_integration import (IntegrationTests, kpet_run_generate,
-                                    COMMONTREE_XML, create_asset_files,
-                                    SUITE_BASE)
+from tests.test_integration import (IntegrationTests, COMMONTREE_XML,
+                                    create_asset_files, SUITE_BASE,
+                                    SUITE1_JOB_TOKENS)
 
 
 class IntegrationMatchTreesArchesTests(IntegrationTests):
@@ -51,14 +51,12 @@ class IntegrationMatchTreesArchesTests(IntegrationTests):
 
         assets_path = create_asset_files(self.test_dir, assets)
 
-        # Doesn't match a non-empty (default "arch") architecture
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            stdout_matching=r'.*<job>\s*</job>.*')
-        # Doesn't match empty architecture
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path, "-a", "",
-            stdout_matching=r'.*<job>\s*</job>.*')
+        self.assertKpetGeneratesJobs(assets_path, [
+            # Doesn't match a non-empty (default "arch") architecture
+            ((), []),
+            # Doesn't match empty architecture
+            (("-a", ""), []),
+        ])
 
     def test_match_arches_one_pattern(self):
         """Test architecture-matching a case with one pattern"""
@@ -91,18 +89,14 @@ class IntegrationMatchTreesArchesTests(IntegrationTests):
 
         assets_path = create_asset_files(self.test_dir, assets)
 
-        # Matches default ("arch") architecture
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # Doesn't match empty architecture
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path, "-a", "",
-            stdout_matching=r'.*<job>\s*</job>.*')
-        # Doesn't match another architecture
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path, "-a", "not_arch",
-            stdout_matching=r'.*<job>\s*</job>.*')
+        self.assertKpetGeneratesJobs(assets_path, [
+            # Matches default ("arch") architecture
+            ((), SUITE1_JOB_TOKENS),
+            # Doesn't match empty architecture
+            (("-a", ""), []),
+            # Doesn't match another architecture
+            (("-a", "not_arch"), []),
+        ])
 
     def test_match_arches_two_patterns(self):
         """Test architecture-matching a case with two patterns"""
@@ -139,23 +133,16 @@ class IntegrationMatchTreesArchesTests(IntegrationTests):
 
         assets_path = create_asset_files(self.test_dir, assets)
 
-        # Matches default ("arch") architecture
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # Matches non-default (but listed) architecture
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            "-a", "other_arch",
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # Doesn't match empty architecture
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path, "-a", "",
-            stdout_matching=r'.*<job>\s*</job>.*')
-        # Doesn't match another architecture
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path, "-a", "not_arch",
-            stdout_matching=r'.*<job>\s*</job>.*')
+        self.assertKpetGeneratesJobs(assets_path, [
+            # Matches default ("arch") architecture
+            ((), SUITE1_JOB_TOKENS),
+            # Matches non-default (but listed) architecture
+            (("-a", "other_arch"), SUITE1_JOB_TOKENS),
+            # Doesn't match empty architecture
+            (("-a", ""), []),
+            # Doesn't match another architecture
+            (("-a", "not_arch"), []),
+        ])
 
     def test_match_trees_no_patterns(self):
         """Test tree-matching a case with no patterns"""
@@ -190,14 +177,12 @@ class IntegrationMatchTreesArchesTests(IntegrationTests):
 
         assets_path = create_asset_files(self.test_dir, assets)
 
-        # Doesn't match a non-empty (default "tree") tree
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            stdout_matching=r'.*<job>\s*</job>.*')
-        # Doesn't match empty tree
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path, "-t", "",
-            stdout_matching=r'.*<job>\s*</job>.*')
+        self.assertKpetGeneratesJobs(assets_path, [
+            # Doesn't match a non-empty (default "tree") tree
+            ((), []),
+            # Doesn't match empty tree
+            (("-t", ""), []),
+        ])
 
     def test_match_trees_one_pattern(self):
         """Test tree-matching a case with one pattern"""
@@ -234,18 +219,14 @@ class IntegrationMatchTreesArchesTests(IntegrationTests):
 
         assets_path = create_asset_files(self.test_dir, assets)
 
-        # Matches default ("tree") tree
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # Doesn't match empty tree
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path, "-t", "",
-            stdout_matching=r'.*<job>\s*</job>.*')
-        # Doesn't match another tree
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path, "-t", "not_tree",
-            stdout_matching=r'.*<job>\s*</job>.*')
+        self.assertKpetGeneratesJobs(assets_path, [
+            # Matches default ("tree") tree
+            ((), SUITE1_JOB_TOKENS),
+            # Doesn't match empty tree
+            (("-t", ""), []),
+            # Doesn't match another tree
+            (("-t", "not_tree"), []),
+        ])
 
     def test_match_trees_two_patterns(self):
         """Test tree-matching a case with two patterns"""
@@ -288,20 +269,13 @@ class IntegrationMatchTreesArchesTests(IntegrationTests):
 
         assets_path = create_asset_files(self.test_dir, assets)
 
-        # Matches default ("tree") tree
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # Matches non-default (but listed) tree
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path,
-            "-t", "other_tree",
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
-        # Doesn't match empty tree
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path, "-t", "",
-            stdout_matching=r'.*<job>\s*</job>.*')
-        # Doesn't match another tree
-        self.assertKpetProduces(
-            kpet_run_generate, assets_path, "-t", "not_tree",
-            stdout_matching=r'.*<job>\s*</job>.*')
+        self.assertKpetGeneratesJobs(assets_path, [
+            # Matches default ("tree") tree
+            ((), SUITE1_JOB_TOKENS),
+            # Matches non-default (but listed) tree
+            (("-t", "other_tree"), SUITE1_JOB_TOKENS),
+            # Doesn't match empty tree
+            (("-t", ""), []),
+            # Doesn't match another tree
+            (("-t", "not_tree"), []),
+        ])
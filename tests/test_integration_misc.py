@@ -15,7 +15,7 @@
 from tests.test_integration import (IntegrationTests, kpet_run_generate,
                                     kpet_with_db, COMMONTREE_XML,
                                     INDEX_BASE_YAML, create_asset_files,
-                                    SUITE_BASE)
+                                    SUITE_BASE, SUITE1_JOB_TOKENS)
 
 
 class IntegrationMiscTests(IntegrationTests):
@@ -80,8 +80,8 @@ class IntegrationMiscTests(IntegrationTests):
 
         assets_path = create_asset_files(self.test_dir, assets)
 
-        self.assertKpetProduces(kpet_run_generate, assets_path,
-                                stdout_matching=r'.*<job>\s*</job>.*')
+        self.assertKpetProducesJob(kpet_run_generate, assets_path,
+                                   tokens=[])
 
     def test_missing_tree_template_run_generate(self):
         """Test run generation with a missing tree template"""
@@ -243,8 +243,8 @@ class IntegrationMiscTests(IntegrationTests):
 
         assets_path = create_asset_files(self.test_dir, assets)
 
-        self.assertKpetProduces(kpet_run_generate, assets_path,
-                                stdout_matching=r'.*<job>\s*</job>.*')
+        self.assertKpetProducesJob(kpet_run_generate, assets_path,
+                                   tokens=[])
 
     def test_empty_case_no_patterns_run_generate(self):
         """Test run generation with an empty test case without patterns"""
@@ -264,9 +264,9 @@ class IntegrationMiscTests(IntegrationTests):
 
         assets_path = create_asset_files(self.test_dir, assets)
 
-        self.assertKpetProduces(
+        self.assertKpetProducesJob(
             kpet_run_generate, assets_path,
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
+            tokens=SUITE1_JOB_TOKENS)
 
     def test_empty_case_with_a_pattern_run_generate(self):
         """Test run generation with an empty test case with a pattern"""
@@ -286,9 +286,9 @@ class IntegrationMiscTests(IntegrationTests):
 
         assets_path = create_asset_files(self.test_dir, assets)
 
-        self.assertKpetProduces(
+        self.assertKpetProducesJob(
             kpet_run_generate, assets_path,
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*</job>.*')
+            tokens=SUITE1_JOB_TOKENS)
 
     def test_preparation_tasks_are_added(self):
         """Test source-matching with a specific case"""
@@ -351,10 +351,9 @@ class IntegrationMiscTests(IntegrationTests):
 
         assets_path = create_asset_files(self.test_dir, assets)
 
-        self.assertKpetProduces(
+        self.assertKpetProducesJob(
             kpet_run_generate, assets_path,
-            stdout_matching=r'.*<job>\s*first_suite_with_name - '
-                            r'case1\s*</job>.*')
+            tokens=['first_suite_with_name', '-', 'case1'])
 
     def test_cases_expose_their_maintainers(self):
         """Test cases' "Maintainers" field should be exposed to templates"""
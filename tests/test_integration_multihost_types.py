@@ -14,7 +14,7 @@
 """Integration multihost tests"""
 from tests.test_integration import (IntegrationTests, kpet_run_generate,
                                     COMMONTREE_XML, create_asset_files,
-                                    SUITE_BASE)
+                                    SUITE_BASE, BOTH_SUITES_JOB_TOKENS)
 
 INDEX_BASE = """
                 host_type_regex: ^normal
@@ -284,10 +284,9 @@ class IntegrationMultihostTypesTests(IntegrationTests):
 
         assets_path = create_asset_files(self.test_dir, assets)
 
-        self.assertKpetProduces(
+        self.assertKpetProducesJob(
             kpet_run_generate, assets_path,
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*'
-                            r'HOST\s*suite2 - case2\s*</job>.*')
+            tokens="HOST suite1 - case1 HOST suite2 - case2".split())
 
     def test_multihost_two_types_both_cases_first(self):
         """
@@ -338,10 +337,9 @@ class IntegrationMultihostTypesTests(IntegrationTests):
         assets_path = create_asset_files(self.test_dir, assets)
 
         # TODO Distinguish host types somehow
-        self.assertKpetProduces(
+        self.assertKpetProducesJob(
             kpet_run_generate, assets_path,
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*'
-                            r'suite2 - case2\s*</job>.*')
+            tokens=BOTH_SUITES_JOB_TOKENS)
 
     def test_multihost_two_types_both_cases_second(self):
         """
@@ -392,10 +390,9 @@ class IntegrationMultihostTypesTests(IntegrationTests):
         assets_path = create_asset_files(self.test_dir, assets)
 
         # TODO Distinguish host types somehow
-        self.assertKpetProduces(
+        self.assertKpetProducesJob(
             kpet_run_generate, assets_path,
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*'
-                            r'suite2 - case2\s*</job>.*')
+            tokens=BOTH_SUITES_JOB_TOKENS)
 
     def test_multihost_two_types_both_cases_both(self):
         """
@@ -451,10 +448,9 @@ class IntegrationMultihostTypesTests(IntegrationTests):
         assets_path = create_asset_files(self.test_dir, assets)
 
         # TODO Distinguish host types somehow
-        self.assertKpetProduces(
+        self.assertKpetProducesJob(
             kpet_run_generate, assets_path,
-            stdout_matching=r'.*<job>\s*HOST\s*suite1 - case1\s*'
-                            r'suite2 - case2\s*</job>.*')
+            tokens=BOTH_SUITES_JOB_TOKENS)
 
     def test_multihost_one_type_suite_wrong_regex(self):
         """Test multihost schema invalid error with wrong suite regexes"""